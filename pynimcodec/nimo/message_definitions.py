@@ -3,6 +3,7 @@ import json
 import logging
 import os
 from collections import OrderedDict
+from functools import lru_cache
 
 from . import ET, XML_NAMESPACE
 from .fields import (
@@ -253,25 +254,17 @@ class MessageDefinitions:
 def extract_bits(data: bytes, offset: int, length: int) -> int:
     """"""
     mask = 2**length - 1
-    data_int = int.from_bytes(data, 'big')
-    shift = 8*len(data) - (offset + length)
-    try:
-        return (data_int >> shift) & mask
-    except ValueError as exc:
-        _log.error(exc)
+    end = (offset + length + 7) // 8   #: only convert the bytes spanned
+    if end > len(data):
+        _log.error('Bits %d-%d exceed %d bytes of data',
+                   offset, offset + length, len(data))
+        return None
+    data_int = int.from_bytes(data[offset // 8:end], 'big')
+    return (data_int >> (8*end - (offset + length))) & mask
 
 
 def parse_field(field: dict, data: bytes, offset: int) -> 'tuple[dict, int]':
     """"""
-    handler = {
-        'arrayField': parse_array_field,
-        'uintField': parse_uint_field,
-        'intField': parse_int_field,
-        'boolField': parse_bool_field,
-        'enumField': parse_enum_field,
-        'stringField': parse_str_field,
-        'dataField': parse_data_field,
-    }
     field_type = field.get('type')
     if 'optional' in field:
         field_present = extract_bits(data, offset, 1)
@@ -280,9 +273,9 @@ def parse_field(field: dict, data: bytes, offset: int) -> 'tuple[dict, int]':
         field_present = 1
     if not field_present:
         return {}, offset
-    if field_type not in handler:
+    if field_type not in _FIELD_PARSERS:
         raise ValueError(f'No handler for field_type {field_type}')
-    return handler[field_type](field, data, offset)
+    return _FIELD_PARSERS[field_type](field, data, offset)
 
 
 def parse_generic(field: dict, value) -> dict:
@@ -388,32 +381,78 @@ def parse_array_field(field: dict, data: bytes, offset: int) -> 'tuple[dict, int
     return decoded, offset
 
 
+_FIELD_PARSERS = {
+    'arrayField': parse_array_field,
+    'uintField': parse_uint_field,
+    'intField': parse_int_field,
+    'boolField': parse_bool_field,
+    'enumField': parse_enum_field,
+    'stringField': parse_str_field,
+    'dataField': parse_data_field,
+}
+
+
+def _load_codec(codec_path: str, override_sin: bool = False) -> dict:
+    """Returns the JSON codec for a file, parsing it only if it changed.
+
+    The returned dictionary is shared between calls and must not be modified.
+    """
+    if not codec_path.endswith(('.idpmsg', '.xml', '.json')):
+        raise ValueError(f'Unsupported codec file type {codec_path}')
+    codec_path = os.path.abspath(codec_path)
+    stat = os.stat(codec_path)
+    return _parse_codec(codec_path, stat.st_mtime_ns, stat.st_size, override_sin)
+
+
+@lru_cache(maxsize=32)
+def _parse_codec(codec_path: str,
+                 mtime_ns: int,
+                 size: int,
+                 override_sin: bool) -> dict:
+    """Parses a codec file, cached by path, file stats and SIN option."""
+    try:
+        with open(codec_path, 'rb') as f:
+            head = f.read(1024)
+            if head.lstrip(b'\xef\xbb\xbf \t\r\n').startswith((b'{', b'[')):
+                return json.loads((head + f.read()).decode('utf-8-sig'))
+        md: MessageDefinitions = MessageDefinitions.from_mdf(
+            codec_path, override_sin=override_sin
+        )
+        return md.json()
+    except (ET.ParseError, json.JSONDecodeError, UnicodeDecodeError) as exc:
+        raise ValueError(f'Unable to parse codec {codec_path}') from exc
+
+
 def decode_message(data: bytes,
-                   codec_path: str,
+                   codec_path: 'str|dict',
                    mobile_originated: bool = True,
                    **kwargs) -> dict:
-    """Decodes a message using the codec specified."""
+    """Decodes a message using the codec specified.
+    
+    Args:
+        data: The message bytes including the SIN and MIN header.
+        codec_path: The path to a codec file, or a codec dictionary as
+            returned by `MessageDefinitions.json()`. Files are parsed once
+            and cached until they change. A dictionary is used as-is, so
+            callers holding parsed definitions should convert them once
+            and reuse the result.
+        mobile_originated: Set False to decode a mobile-terminated message.
+        **override_sin (bool): Passed to `MessageDefinitions.from_mdf` when
+            loading a codec file. Has no effect if `codec_path` is a codec
+            dictionary; set it when calling `from_mdf` instead.
+
+    """
     if not isinstance(data, (bytes, bytearray)):
         raise ValueError('Invalid data bytes')
-    if not os.path.exists(codec_path):
+    if isinstance(codec_path, dict):
+        codec = codec_path
+    elif not os.path.exists(codec_path):
         raise ValueError('Invalid codec path')
-    codec = None
+    else:
+        codec = _load_codec(codec_path, kwargs.get('override_sin', False))
     codec_sin = data[0]
     codec_min = data[1]
     decoded = {}
-    try:
-        if codec_path.endswith(('.idpmsg', '.xml', '.json')):
-            override_sin = kwargs.get('override_sin', False)
-            md: MessageDefinitions = MessageDefinitions.from_mdf(
-                codec_path, override_sin=override_sin
-            )
-            codec = md.json()
-    except ET.ParseError:
-        try:
-           with open(codec_path) as f:
-               codec = json.load(f, object_pairs_hook=OrderedDict)
-        except json.JSONDecodeError:
-            raise ValueError('Unable to parse codec %s', codec_path)
     assert isinstance(codec, dict)
     msgdef: dict = codec.get('nimoMessageDefinition')
     services: 'list[dict]' = msgdef.get('services')
@@ -134,16 +134,15 @@ class MessageCodec(BaseCodec):
             bin_str += field.encode()
         for _ in range(0, 8 - len(bin_str) % 8):   #:pad to next byte
             bin_str += '0'
-        _format = f'0{int(len(bin_str) / 8 * 2)}X'   #:hex bytes 2 chars
-        hex_str = format(int(bin_str, 2), _format)
-        if (self.is_forward and len(hex_str) / 2 > 9998 or
-            not self.is_forward and len(hex_str) / 2 > 6398):
-            raise ValueError(f'{len(hex_str) / 2} bytes exceeds maximum size'
+        payload = int(bin_str, 2).to_bytes(len(bin_str) // 8, 'big')
+        if (self.is_forward and len(payload) > 9998 or
+            not self.is_forward and len(payload) > 6398):
+            raise ValueError(f'{len(payload)} bytes exceeds maximum size'
                              ' for Payload')
         if data_format == DataFormat.HEX:
-            data = hex_str
+            data = payload.hex().upper()
         else:
-            data = b2a_base64(bytearray.fromhex(hex_str)).strip().decode()
+            data = b2a_base64(payload, newline=False).decode()
         return {
             'sin': self.sin,
             'min': self.min,
@@ -5,9 +5,14 @@ _log = logging.getLogger(__name__)
 
 
 def parse_xml_file(filename: str):
-    ns = dict([node for _, node in ET.iterparse(filename, events=['start-ns'])])
-    tree = ET.parse(filename)
-    root = tree.getroot()
+    ns = {}
+    root = None
+    for event, node in ET.iterparse(filename, events=('start-ns', 'end')):
+        if event == 'start-ns':
+            prefix, uri = node
+            ns[prefix] = uri
+        else:
+            root = node   #: the last element closed is the document root
     if root.tag != 'MessageDefinition':
         raise ValueError
     if not root.find('Services'):
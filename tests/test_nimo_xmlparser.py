@@ -1,13 +1,20 @@
 import os
+from pathlib import Path
+
+import pytest
 
 from pynimcodec.nimo.xmlparser import parse_xml_file
 
 
-test_file = os.path.join(os.getcwd(), 'tests/examples/nimotestxml.idpmsg')
+_ROOT = Path(__file__).resolve().parent.parent
+TEST_FILES = [
+    str(_ROOT / 'tests/examples/nimotestxml.idpmsg'),
+    str(_ROOT / 'tests/examples/fieldedge-iotdemo.idpmsg'),
+]
 
-def test_xmlparser():
+@pytest.mark.parametrize('test_file', TEST_FILES, ids=os.path.basename)
+def test_xmlparser(test_file: str):
     if not os.path.exists(test_file):
-        raise ValueError
+        pytest.skip(f'{test_file} not found')
     root = parse_xml_file(test_file)
     assert root is not None
-    
\ No newline at end of file